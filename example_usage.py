@@ -5,9 +5,113 @@ MCP本地助手服务器使用示例
 
 import asyncio
 import json
+import os
+import sys
+import threading
+from contextlib import AsyncExitStack
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
+try:
+    # orjson解析更快，未安装时回退到标准库json
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    # uvloop事件循环更快（Windows不支持），未安装时使用asyncio默认循环
+    from uvloop import run as run_async
+except ImportError:
+    run_async = asyncio.run
+
+
+def _stdin_encoding() -> str:
+    """返回fd 0上原始字节的编码"""
+    if os.name == "nt" and sys.stdin.isatty():
+        # Windows控制台下sys.stdin.encoding为utf-8（PEP 528），但os.read读到的是控制台代码页字节
+        import ctypes
+        return f"cp{ctypes.windll.kernel32.GetConsoleCP()}"
+    return sys.stdin.encoding or "utf-8"
+
+
+async def ainput(prompt: str = "") -> str:
+    """在守护线程中读取一行输入，不阻塞事件循环，且等待可被取消（如Ctrl-C）"""
+    # 不用run_in_executor：Ctrl-C后事件循环关闭时会等待仍阻塞在input()的线程池线程，导致进程挂起；
+    # 也不引入aioconsole依赖。守护线程不会阻止退出。
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def set_outcome(line, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(line)
+    
+    encoding = _stdin_encoding()
+    
+    def reader():
+        # 直接读取文件描述符而不是sys.stdin，避免退出时守护线程持有stdin缓冲区锁
+        line, error = None, None
+        try:
+            data = bytearray()
+            while True:
+                ch = os.read(sys.stdin.fileno(), 1)
+                if not ch or ch == b"\n":
+                    break
+                data += ch
+            if not ch and not data:
+                error = EOFError()
+            else:
+                line = data.decode(encoding, errors="replace").rstrip("\r")
+        except BaseException as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(set_outcome, line, error)
+        except RuntimeError:
+            pass  # 事件循环已关闭
+    
+    print(prompt, end="", flush=True)
+    threading.Thread(target=reader, daemon=True).start()
+    return await future
+
+
+class MCPSessionPool:
+    """MCP会话池：启动多个服务器进程，按轮询方式分配工具调用"""
+    
+    def __init__(self, server_params: StdioServerParameters, size: int = 4):
+        self.server_params = server_params
+        self.size = size
+        self._sessions = []
+        self._next = 0
+        self._stack = None
+    
+    async def __aenter__(self):
+        self._stack = AsyncExitStack()
+        await self._stack.__aenter__()
+        try:
+            for _ in range(self.size):
+                read, write = await self._stack.enter_async_context(stdio_client(self.server_params))
+                session = await self._stack.enter_async_context(ClientSession(read, write))
+                self._sessions.append(session)
+            await asyncio.gather(*(session.initialize() for session in self._sessions))
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self._sessions.clear()
+        return await self._stack.__aexit__(*exc_info)
+    
+    async def call_tool(self, name: str, arguments: dict):
+        """在下一个会话上调用工具"""
+        session = self._sessions[self._next]
+        self._next = (self._next + 1) % len(self._sessions)
+        return await session.call_tool(name, arguments)
+
+
 async def test_mcp_server():
     """测试MCP服务器功能"""
     
@@ -20,24 +124,28 @@ async def test_mcp_server():
     async with stdio_client(server_params) as (read, write):
         async with ClientSession(read, write) as session:
             
-            # 初始化连接
+            # 初始化连接（协议要求先完成初始化）
             await session.initialize()
             
             print("🚀 MCP本地助手服务器测试")
             print("=" * 50)
             
+            # 工具列表和系统信息互不依赖，同时发出请求
+            tools, result = await asyncio.gather(
+                session.list_tools(),
+                session.call_tool("get_system_info", {"info_type": "basic"})
+            )
+            
             # 1. 获取可用工具列表
             print("\n📋 获取工具列表...")
-            tools = await session.list_tools()
             print(f"可用工具数量: {len(tools.tools)}")
             for tool in tools.tools:
                 print(f"  - {tool.name}: {tool.description}")
             
             # 2. 测试系统信息获取
             print("\n💻 获取系统信息...")
-            result = await session.call_tool("get_system_info", {"info_type": "basic"})
             if result.content:
-                system_info = json.loads(result.content[0].text)
+                system_info = json_loads(result.content[0].text)
                 print(f"操作系统: {system_info.get('system')}")
                 print(f"平台: {system_info.get('platform')}")
                 print(f"处理器: {system_info.get('processor')}")
@@ -54,7 +162,7 @@ async def test_mcp_server():
                 print(f"执行: {cmd_info['command']}")
                 result = await session.call_tool("execute_command", cmd_info)
                 if result.content:
-                    output = json.loads(result.content[0].text)
+                    output = json_loads(result.content[0].text)
                     if output.get('returncode') == 0:
                         print(f"✅ 输出: {output.get('stdout', '').strip()}")
                     else:
@@ -63,7 +171,7 @@ async def test_mcp_server():
             # 4. 测试文件操作
             print("\n📁 文件操作测试...")
             test_file = "test_mcp.txt"
-            test_content = "这是MCP服务器的测试文件\n当前时间: " + str(asyncio.get_event_loop().time())
+            test_content = f"这是MCP服务器的测试文件\n当前时间: {asyncio.get_running_loop().time()}"
             
             # 写入文件
             result = await session.call_tool("file_operations", {
@@ -158,7 +266,7 @@ async def interactive_mode():
             
             while True:
                 try:
-                    user_input = input("\n> ").strip()
+                    user_input = (await ainput("\n> ")).strip()
                     
                     if user_input.lower() in ['quit', 'exit', 'q']:
                         break
@@ -181,9 +289,9 @@ async def interactive_mode():
                     tool_name = parts[0]
                     try:
                         if len(parts) == 2:
-                            args = json.loads(parts[1])
+                            args = json_loads(parts[1])
                         else:
-                            args = json.loads(' '.join(parts[1:]))
+                            args = json_loads(' '.join(parts[1:]))
                     except json.JSONDecodeError:
                         print("❌ JSON格式错误")
                         continue
@@ -193,7 +301,7 @@ async def interactive_mode():
                     if result.content:
                         print(f"📤 结果: {result.content[0].text}")
                     
-                except KeyboardInterrupt:
+                except (KeyboardInterrupt, EOFError):
                     break
                 except Exception as e:
                     print(f"❌ 错误: {e}")
@@ -216,6 +324,7 @@ def print_help():
 
 示例命令:
   execute_command {"command": "echo hello", "shell": true}
+  execute_command_batch {"commands": [{"command": "echo a", "shell": true}]}
   get_system_info {"info_type": "basic"}
   file_operations {"operation": "list", "path": "."}
   open_url {"url": "https://google.com"}
@@ -237,47 +346,60 @@ async def benchmark_mode():
         args=["mcp_server.py"]
     )
     
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            
-            # 测试命令执行性能
-            import time
-            
-            print("测试命令执行性能...")
-            start_time = time.time()
-            
-            tasks = []
-            for i in range(10):
-                task = session.call_tool("execute_command", {
-                    "command": f"echo test_{i}",
-                    "shell": True
-                })
-                tasks.append(task)
-            
-            results = await asyncio.gather(*tasks)
-            end_time = time.time()
-            
-            successful = sum(1 for r in results if r.content and "test_" in r.content[0].text)
-            
-            print(f"📊 性能测试结果:")
-            print(f"  - 总时间: {end_time - start_time:.2f}秒")
-            print(f"  - 成功执行: {successful}/10")
-            print(f"  - 平均每个命令: {(end_time - start_time)/10:.3f}秒")
+    pool_size = 2
+    command_count = 10
+    
+    async with MCPSessionPool(server_params, size=pool_size) as pool:
+        # 测试命令执行性能
+        import time
+        
+        print("测试命令执行性能...")
+        start_time = time.time()
+        
+        # 每个服务器进程一次批量调用，多个进程并行执行
+        commands = [
+            {"command": f"echo test_{i}", "shell": True}
+            for i in range(command_count)
+        ]
+        batches = [commands[i::pool_size] for i in range(pool_size)]
+        batch_results = await asyncio.gather(*(
+            pool.call_tool("execute_command_batch", {"commands": batch})
+            for batch in batches
+        ))
+        end_time = time.time()
+        
+        successful = 0
+        for result in batch_results:
+            if result.isError or not result.content:
+                continue
+            try:
+                results = json_loads(result.content[0].text)
+            except json.JSONDecodeError:
+                # 服务器返回了错误文本，该批命令全部计为失败
+                continue
+            successful += sum(1 for r in results if "test_" in r.get("stdout", ""))
+        
+        print(f"📊 性能测试结果:")
+        print(f"  - 服务器进程数: {pool_size}")
+        print(f"  - 总时间: {end_time - start_time:.2f}秒")
+        print(f"  - 成功执行: {successful}/{command_count}")
+        print(f"  - 平均每个命令: {(end_time - start_time)/command_count:.3f}秒")
 
 
 def main():
     """主函数"""
-    import sys
-    
     if len(sys.argv) > 1:
         mode = sys.argv[1].lower()
         if mode == "test":
-            asyncio.run(test_mcp_server())
+            run_async(test_mcp_server())
         elif mode == "interactive":
-            asyncio.run(interactive_mode())
+            try:
+                run_async(interactive_mode())
+            except KeyboardInterrupt:
+                # Ctrl-C会取消交互任务，由事件循环在此重新抛出KeyboardInterrupt
+                print("👋 再见！")
         elif mode == "benchmark":
-            asyncio.run(benchmark_mode())
+            run_async(benchmark_mode())
         else:
             print("❌ 未知模式。可用模式: test, interactive, benchmark")
     else:
@@ -11,6 +11,7 @@ import sys
 import webbrowser
 import platform
 import os
+import signal
 from typing import Any, Dict, List, Optional
 import requests
 import anthropic
@@ -28,6 +29,9 @@ from mcp.types import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 批量执行时同时运行的最大命令数
+MAX_BATCH_CONCURRENCY = 4
+
 class LocalMCPServer:
     def __init__(self, claude_api_key: Optional[str] = None):
         """初始化MCP服务器"""
@@ -72,6 +76,29 @@ class LocalMCPServer:
                             "required": ["command"]
                         }
                     ),
+                    Tool(
+                        name="execute_command_batch",
+                        description="批量执行本地系统命令",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "commands": {
+                                    "type": "array",
+                                    "description": "要执行的命令列表，每项参数同execute_command",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "command": {"type": "string"},
+                                            "shell": {"type": "boolean", "default": False},
+                                            "timeout": {"type": "number", "default": 30}
+                                        },
+                                        "required": ["command"]
+                                    }
+                                }
+                            },
+                            "required": ["commands"]
+                        }
+                    ),
                     Tool(
                         name="open_application",
                         description="打开本地应用程序或文件",
@@ -197,6 +224,8 @@ class LocalMCPServer:
             try:
                 if name == "execute_command":
                     return await self._execute_command(**arguments)
+                elif name == "execute_command_batch":
+                    return await self._execute_command_batch(**arguments)
                 elif name == "open_application":
                     return await self._open_application(**arguments)
                 elif name == "open_url":
@@ -219,33 +248,59 @@ class LocalMCPServer:
                     content=[TextContent(type="text", text=f"错误: {str(e)}")]
                 )
 
-    async def _execute_command(self, command: str, shell: bool = False, timeout: int = 30) -> CallToolResult:
-        """执行系统命令"""
+    async def _run_command(self, command: str, shell: bool = False, timeout: int = 30) -> Dict[str, Any]:
+        """运行单条命令并返回输出"""
+        if shell:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True  # 独立进程组，超时时可结束shell派生的所有子进程（仅POSIX）
+            )
+        else:
+            cmd_parts = command.split()
+            process = await asyncio.create_subprocess_exec(
+                *cmd_parts,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+        
         try:
-            if shell:
-                process = await asyncio.create_subprocess_shell(
-                    command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-            else:
-                cmd_parts = command.split()
-                process = await asyncio.create_subprocess_exec(
-                    *cmd_parts,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-            
             stdout, stderr = await asyncio.wait_for(
                 process.communicate(), 
                 timeout=timeout
             )
-            
-            result = {
-                "returncode": process.returncode,
-                "stdout": stdout.decode('utf-8', errors='ignore'),
-                "stderr": stderr.decode('utf-8', errors='ignore')
-            }
+        except asyncio.TimeoutError:
+            # 超时后结束子进程，避免遗留孤儿进程
+            self._kill_process(process)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass  # 不再等待仍未关闭的管道
+            raise
+        
+        return {
+            "returncode": process.returncode,
+            "stdout": stdout.decode('utf-8', errors='ignore'),
+            "stderr": stderr.decode('utf-8', errors='ignore')
+        }
+
+    @staticmethod
+    def _kill_process(process) -> None:
+        """结束子进程及其所在进程组"""
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass  # 进程已退出
+
+    async def _execute_command(self, command: str, shell: bool = False, timeout: int = 30) -> CallToolResult:
+        """执行系统命令"""
+        try:
+            result = await self._run_command(command, shell, timeout)
             
             return CallToolResult(
                 content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
@@ -259,6 +314,25 @@ class LocalMCPServer:
                 content=[TextContent(type="text", text=f"命令执行失败: {str(e)}")]
             )
 
+    async def _execute_command_batch(self, commands: List[Dict[str, Any]]) -> CallToolResult:
+        """批量执行系统命令，同时运行的命令数不超过MAX_BATCH_CONCURRENCY"""
+        semaphore = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+        
+        async def run_one(cmd_info: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                async with semaphore:
+                    return await self._run_command(**cmd_info)
+            except asyncio.TimeoutError:
+                return {"error": "命令执行超时"}
+            except Exception as e:
+                return {"error": f"命令执行失败: {str(e)}"}
+        
+        results = await asyncio.gather(*(run_one(cmd_info) for cmd_info in commands))
+        
+        return CallToolResult(
+            content=[TextContent(type="text", text=json.dumps(results, ensure_ascii=False, indent=2))]
+        )
+
     async def _open_application(self, path: str, args: List[str] = None) -> CallToolResult:
         """打开应用程序"""
         try: